@@ -14,17 +14,38 @@ Examples:
 
 import argparse
 import datetime
+import functools
+import hashlib
+import importlib.util
 import os
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
+    import numpy as np
     import pandas as pd
     import tushare as ts
 except ImportError:
-    print("Error: Missing dependencies. Run: pip install tushare pandas")
+    print("Error: Missing dependencies. Run: pip install tushare pandas pyarrow")
     sys.exit(1)
 
+# 开启写时复制，筛选后的子表无需再.copy() (pandas 3起默认开启，该选项已弃用)
+if int(pd.__version__.split('.')[0]) < 3:
+    try:
+        pd.set_option('mode.copy_on_write', True)
+    except (AttributeError, KeyError):
+        pass
+
+# 性能说明: 本脚本是网络I/O密集型，耗时几乎全部在 tushare pro_api 的
+# HTTPS 往返上 (trade_cal / daily_basic / stock_basic / fina_indicator)。
+# pandas 过滤只占毫秒级，优化应优先减少请求次数、复用连接和缓存结果。
+# 设置环境变量 SCREEN_TIMING=1 可打印每次接口调用耗时。
+TIMING = os.environ.get('SCREEN_TIMING', '').strip().lower() not in ('', '0', 'false', 'no')
+
 # 配置
 DEFAULT_TOKEN = ''  # 默认空，需要通过参数传入
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN', '')
@@ -35,7 +56,28 @@ REPO_OWNER = 'vaneli5'
 REPO_NAME = 'agent-memo'
 BRANCH = 'main'
 
+# 本地缓存配置 (同一交易日重复运行时跳过网络请求)
+CACHE_DIR = Path.home() / '.cache' / 'value-other-side'
+DAILY_CACHE_TTL = 6 * 3600
+BASIC_CACHE_TTL = 24 * 3600
+HISTORY_DIR = CACHE_DIR / 'history'
+# parquet读写需要pyarrow或fastparquet (可选依赖，缺少时不缓存)
+HAS_PARQUET = any(importlib.util.find_spec(m) for m in ('pyarrow', 'fastparquet'))
+
+# fina_indicator 并发配置 (受tushare限频约束，不宜过大)
+ROE_BATCH_SIZE = 100
+ROE_WORKERS = 4
+
+# ST/退市股名称匹配
+ST_PATTERN = re.compile('ST|退')
+
+# 排除的交易所代码后缀 (北交所、科创板)
+EXCLUDED_EXCHANGES = {'BJ', 'KCB'}
+_GH_SESSION = None
+_GH_SESSION_LOCK = threading.Lock()
+
 
+@functools.lru_cache(maxsize=None)
 def get_token(token=None):
     """获取tushare token: 参数 > 环境变量 > ~/.aj-skills/.env"""
     if token:
@@ -49,51 +91,197 @@ def get_token(token=None):
     # 读取 ~/.aj-skills/.env
     env_file = Path.home() / ".aj-skills" / ".env"
     if env_file.exists():
-        for line in env_file.read_text().splitlines():
-            if line.startswith('TUSHARE_TOKEN='):
-                return line.split('=', 1)[1].strip()
+        m = re.search(r'^TUSHARE_TOKEN=(.+)$', env_file.read_text(), re.MULTILINE)
+        if m:
+            return m.group(1).strip()
     
     return ''
 
 
-def fetch_data(token):
-    """获取今日行情数据"""
+@functools.lru_cache(maxsize=1)
+def get_pro(token):
+    """获取复用的tushare pro_api客户端"""
     ts.set_token(token)
-    pro = ts.pro_api(token)
+    return ts.pro_api(token)
+
+
+def timed_call(name, func, **kwargs):
+    """调用tushare接口并记录耗时"""
+    start = time.perf_counter()
+    try:
+        return func(**kwargs)
+    finally:
+        if TIMING:
+            print(f"  [耗时] {name}: {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+def prune_cache(prefix, ttl):
+    """删除同前缀且已过期的缓存文件，避免缓存目录无限增长"""
+    now = time.time()
+    for path in CACHE_DIR.glob(f"{prefix}*"):
+        try:
+            if now - path.stat().st_mtime >= ttl:
+                path.unlink()
+        except OSError:
+            # 并发线程可能已删除
+            pass
+
+
+def cached_call(filename, ttl, name, func, **kwargs):
+    """带本地parquet缓存的接口调用，缓存未过期时直接读取"""
+    if not HAS_PARQUET:
+        return timed_call(name, func, **kwargs)
+    
+    path = CACHE_DIR / filename
+    if path.exists() and (time.time() - path.stat().st_mtime) < ttl:
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            pass
+    
+    df = timed_call(name, func, **kwargs)
+    if df is not None and len(df) > 0:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            prune_cache(filename.rsplit('_', 1)[0] + '_', ttl)
+            df.to_parquet(path)
+        except Exception as e:
+            print(f"  写入缓存失败: {e}")
+    return df
+
+
+def fina_cache_name(batch):
+    """fina_indicator批次的缓存文件名: 代码列表哈希 (过期由TTL控制)"""
+    digest = hashlib.md5(','.join(batch).encode('utf-8')).hexdigest()[:16]
+    return f"fina_indicator_{digest}.parquet"
+
+
+def exclude_mask(series, pattern):
+    """不匹配pattern的行为True (空值保留)，列较小时比str.contains快"""
+    arr = series.to_numpy()
+    return np.fromiter(
+        (not isinstance(v, str) or pattern.search(v) is None for v in arr),
+        dtype=bool, count=len(arr)
+    )
+
+
+def fill_zero(series):
+    """转为float64数组，空值填0 (保持float64，避免阈值比较受舍入影响)"""
+    return series.to_numpy(dtype=float, na_value=0.0)
+
+
+def valuation_mask(df, pe_max, pb_max, turnover_min):
+    """PE/PB/换手率条件，直接在numpy数组上计算"""
+    pe = df['pe_ttm'].to_numpy()
+    pb = df['pb'].to_numpy()
+    turnover = df['turnover_rate'].to_numpy()
+    return (pe > 0) & (pe < pe_max) & (pb > 0) & (pb < pb_max) & (turnover > turnover_min)
+
+
+def fetch_roe_batches(pro, codes, ignore_errors=False):
+    """并发分批获取fina_indicator，返回非空结果列表"""
+    batches = [codes[i:i+ROE_BATCH_SIZE] for i in range(0, len(codes), ROE_BATCH_SIZE)]
+    
+    def fetch(batch):
+        try:
+            return cached_call(fina_cache_name(batch), BASIC_CACHE_TTL, 'fina_indicator', pro.fina_indicator,
+                               ts_code=','.join(batch), fields='ts_code,roe,end_date')
+        except Exception:
+            if not ignore_errors:
+                raise
+            return None
+    
+    with ThreadPoolExecutor(max_workers=ROE_WORKERS) as ex:
+        results = list(ex.map(fetch, batches))
+    return [r for r in results if r is not None and len(r) > 0]
+
+
+def latest_roe(frames):
+    """合并各批次fina_indicator，每只股票只保留最新报告期的ROE"""
+    roe_final = pd.concat(frames, ignore_index=True)
+    end_date = pd.to_numeric(roe_final['end_date'], errors='coerce').fillna(0)
+    idx = end_date.groupby(roe_final['ts_code'], sort=False).idxmax()
+    return roe_final.loc[idx, ['ts_code', 'roe']]
+
+
+def latest_trade_date(pro, today):
+    """获取最近交易日，结果按自然日缓存到本地"""
+    today_str = today.strftime('%Y%m%d')
+    path = CACHE_DIR / f"trade_cal_{today_str}.txt"
+    if path.exists():
+        trade_date = path.read_text().strip()
+        if trade_date:
+            return trade_date
     
-    # 获取最近交易日
-    today = datetime.datetime.now()
     start_date = (today - datetime.timedelta(days=10)).strftime('%Y%m%d')
-    cal_df = pro.trade_cal(exchange='SSE', start_date=start_date, end_date=today.strftime('%Y%m%d'))
+    cal_df = timed_call('trade_cal', pro.trade_cal, exchange='SSE', start_date=start_date, end_date=today_str)
     cal_df = cal_df[cal_df['is_open'] == 1].sort_values('cal_date')
     if len(cal_df) > 0:
         trade_date = cal_df.iloc[-1]['cal_date']
     else:
         # 如果没有开市日，回退到获取所有历史交易日
-        cal_df = pro.trade_cal(exchange='SSE', start_date='20250101', end_date=today.strftime('%Y%m%d'))
+        cal_df = timed_call('trade_cal', pro.trade_cal, exchange='SSE', start_date='20250101', end_date=today_str)
         cal_df = cal_df[cal_df['is_open'] == 1].sort_values('cal_date')
         trade_date = cal_df.iloc[-1]['cal_date']
-    print(f"  使用交易日: {trade_date}")
     
-    # 直接获取所有股票的daily_basic（包含股息率）
-    df = pro.daily_basic(
-        trade_date=trade_date,
-        fields='ts_code,close,pe_ttm,pb,dv_ratio,turnover_rate'
-    )
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        prune_cache('trade_cal_', BASIC_CACHE_TTL)
+        path.write_text(str(trade_date))
+    except OSError:
+        pass
+    return trade_date
+
+
+def fetch_data(token):
+    """获取今日行情数据"""
+    pro = get_pro(token)
     
-    # 获取股票名称、行业、上市日期
-    stocks = pro.stock_basic(
-        exchange='', 
-        list_status='L', 
-        fields='ts_code,name,industry,list_date'
-    )
+    # 获取最近交易日
+    today = datetime.datetime.now()
+    trade_date = latest_trade_date(pro, today)
+    print(f"  使用交易日: {trade_date}")
+    if not HAS_PARQUET:
+        print("  提示: 未安装pyarrow，本地缓存已关闭 (pip install pyarrow)")
+    
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        # 直接获取所有股票的daily_basic（包含股息率）
+        f_daily = ex.submit(
+            cached_call,
+            f"daily_basic_{trade_date}.parquet", DAILY_CACHE_TTL,
+            'daily_basic', pro.daily_basic,
+            trade_date=trade_date,
+            fields='ts_code,close,pe_ttm,pb,dv_ratio,turnover_rate'
+        )
+        
+        # 同时获取股票名称、行业、上市日期
+        f_basic = ex.submit(
+            cached_call,
+            f"stock_basic_{today.strftime('%Y%m%d')}.parquet", BASIC_CACHE_TTL,
+            'stock_basic', pro.stock_basic,
+            exchange='', 
+            list_status='L', 
+            fields='ts_code,name,industry,list_date'
+        )
+        df = f_daily.result()
+        stocks = f_basic.result()
+    
+    # 数值列统一为浮点；参与阈值比较的列保持float64，避免float32舍入越过阈值
+    for col in ('pe_ttm', 'pb', 'dv_ratio', 'turnover_rate'):
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    # 仅用于展示的现价压缩为float32
+    df['close'] = pd.to_numeric(df['close'], errors='coerce', downcast='float')
     
-    # 合并名称和行业
+    # 合并名称和行业 (行业只有约100种，存为category)
     df = df.merge(stocks[['ts_code', 'name', 'industry', 'list_date']], on='ts_code', how='left')
+    df['industry'] = df['industry'].astype('category')
+    # 上市日期转为YYYYMMDD整数 (可空Int32，缺失保留为空)，便于向量化比较
+    df['list_date'] = pd.to_numeric(df['list_date'], errors='coerce').astype('Int32')
     
     # 过滤ST和北交所、科创板
-    df = df[~df['name'].str.contains('ST|退', na=False)]
-    df = df[~df['ts_code'].str.endswith(('.BJ', '.KCB'))]
+    suffix = df['ts_code'].str.rsplit('.', n=1).str[-1]
+    mask = exclude_mask(df['name'], ST_PATTERN) & ~suffix.isin(EXCLUDED_EXCHANGES).to_numpy()
+    df = df[mask]
     
     return df
 
@@ -105,53 +293,43 @@ def filter_stocks(df, token, pe_max=15, pb_max=2, turnover_min=0.5, roe_min=0, d
     if df is None or len(df) == 0:
         return pd.DataFrame()
     
-    # 排除银行
+    # 排除银行/券商/保险/地产 (正则只匹配行业类别，再按类别过滤)
+    patterns = []
     if no_bank:
-        df = df[~df['industry'].str.contains('银行', na=False)]
-    
-    # 排除券商
+        patterns.append('银行')
     if no_broker:
-        df = df[~df['industry'].str.contains('证券|券商', na=False)]
-    
-    # 排除保险
+        patterns.append('证券|券商')
     if no_insurance:
-        df = df[~df['industry'].str.contains('保险', na=False)]
-    
-    # 排除地产
+        patterns.append('保险')
     if no_real_estate:
-        df = df[~df['industry'].str.contains('房地产|地产', na=False)]
+        patterns.append('房地产|地产')
+    if patterns:
+        pattern = re.compile('|'.join(patterns))
+        industries = df['industry'].astype('category').cat.categories
+        banned = [c for c in industries if pattern.search(c)]
+        df = df[~df['industry'].isin(banned)]
     
     # 排除次新股
     if no_new:
-        one_year_ago = (datetime.datetime.now() - datetime.timedelta(days=365)).strftime('%Y%m%d')
-        df = df[df['list_date'] < one_year_ago]
+        one_year_ago = int((datetime.datetime.now() - datetime.timedelta(days=365)).strftime('%Y%m%d'))
+        # 上市日期缺失的视为不满足条件
+        df = df[(df['list_date'] < one_year_ago).to_numpy(dtype=bool, na_value=False)]
     
     # 筛选条件（先不加入ROE和股息，在后面添加）
-    result = df[
-        (df['pe_ttm'] > 0) & (df['pe_ttm'] < pe_max) &
-        (df['pb'] > 0) & (df['pb'] < pb_max) &
-        (df['turnover_rate'] > turnover_min)
-    ].copy()
+    result = df[valuation_mask(df, pe_max, pb_max, turnover_min)]
     
     # 如果需要ROE或股息筛选，获取ROE数据
     if roe_min > 0 or dividend_min > 0:
-        ts.set_token(token)
-        pro = ts.pro_api(token)
+        pro = get_pro(token)
         
         # 获取ROE数据
         try:
             codes = result['ts_code'].tolist()
-            all_roe = []
-            for i in range(0, len(codes), 100):
-                batch = codes[i:i+100]
-                roe_df = pro.fina_indicator(ts_code=','.join(batch), fields='ts_code,roe,end_date')
-                if roe_df is not None and len(roe_df) > 0:
-                    # 取最新报告期
-                    roe_df = roe_df.sort_values('end_date', ascending=False).drop_duplicates('ts_code')
-                    all_roe.append(roe_df[['ts_code', 'roe']])
+            all_roe = fetch_roe_batches(pro, codes)
             
             if all_roe:
-                roe_final = pd.concat(all_roe, ignore_index=True)
+                # 取最新报告期
+                roe_final = latest_roe(all_roe)
                 result = result.merge(roe_final, on='ts_code', how='left')
                 print(f"  获取到 {len(roe_final)} 只ROE")
         except Exception as e:
@@ -161,13 +339,13 @@ def filter_stocks(df, token, pe_max=15, pb_max=2, turnover_min=0.5, roe_min=0, d
         # 筛选ROE
         if roe_min > 0:
             before = len(result)
-            result = result[result['roe'].fillna(0) > roe_min]
+            result = result[fill_zero(result['roe']) > roe_min]
             print(f"  ROE>{roe_min}%: {before} -> {len(result)}")
         
         # 筛选股息率
         if dividend_min > 0:
             before = len(result)
-            result = result[result['dv_ratio'].fillna(0) > dividend_min]
+            result = result[fill_zero(result['dv_ratio']) > dividend_min]
             print(f"  股息率>{dividend_min}%: {before} -> {len(result)}")
     
     # 按PE排序
@@ -176,56 +354,62 @@ def filter_stocks(df, token, pe_max=15, pb_max=2, turnover_min=0.5, roe_min=0, d
     return result
 
 
+def top_k(series, k, largest=True):
+    """返回最大(或最小)的k个值的索引标签，与nlargest/nsmallest一致：忽略空值，同值按原顺序"""
+    series = series.dropna()
+    k = min(k, len(series))
+    if k == 0:
+        return series.index[:0]
+    a = series.to_numpy(dtype=float)
+    if largest:
+        a = -a
+    # 取出第k名及与其并列的所有元素，再按(值, 原位置)排序
+    boundary = a[np.argpartition(a, k - 1)[k - 1]]
+    idx = np.flatnonzero(a <= boundary)
+    idx = idx[np.lexsort((idx, a[idx]))][:k]
+    return series.index[idx]
+
+
 def show_top3(df, token):
     """展示各维度TOP3"""
     if df is None or len(df) == 0:
         print("无数据")
         return
     
-    ts.set_token(token)
-    pro = ts.pro_api(token)
+    pro = get_pro(token)
+    
+    # 先过滤基本条件，只为剩余股票获取ROE
+    df = df[valuation_mask(df, 20, 3, 0.5)]
     
     # 获取ROE数据
     codes = df['ts_code'].tolist()
-    all_roe = []
-    for i in range(0, len(codes), 100):
-        batch = codes[i:i+100]
-        try:
-            roe_df = pro.fina_indicator(ts_code=','.join(batch), fields='ts_code,roe,end_date')
-            if roe_df is not None and len(roe_df) > 0:
-                roe_df = roe_df.sort_values('end_date', ascending=False).drop_duplicates('ts_code')
-                all_roe.append(roe_df[['ts_code', 'roe']])
-        except:
-            pass
+    all_roe = fetch_roe_batches(pro, codes, ignore_errors=True)
     
     if all_roe:
-        roe_df = pd.concat(all_roe, ignore_index=True)
+        roe_df = latest_roe(all_roe)
         df = df.merge(roe_df, on='ts_code', how='left')
-    
-    # 过滤基本条件
-    df = df[(df['pe_ttm'] > 0) & (df['pe_ttm'] < 20) & 
-            (df['pb'] > 0) & (df['pb'] < 3) &
-            (df['turnover_rate'] > 0.5)]
+    else:
+        df = df.assign(roe=np.nan)
     
     print("\n" + "="*80)
     print("各维度TOP3 (PE<20, PB<3, 换手>0.5%)")
     print("="*80)
     
     # 合并成一个表
-    top_roe = df[df['roe'].notna()].nlargest(3, 'roe').copy()
+    top_roe = df.loc[top_k(df['roe'], 3)]
     top_roe['维度'] = '高ROE'
     
-    top_div = df.nlargest(3, 'dv_ratio').copy()
+    top_div = df.loc[top_k(df['dv_ratio'], 3)]
     top_div['维度'] = '高股息'
     
-    top_pe = df.nsmallest(3, 'pe_ttm').copy()
+    top_pe = df.loc[top_k(df['pe_ttm'], 3, largest=False)]
     top_pe['维度'] = '低PE'
     
-    top_pb = df.nsmallest(3, 'pb').copy()
+    top_pb = df.loc[top_k(df['pb'], 3, largest=False)]
     top_pb['维度'] = '低PB'
     
-    df['score'] = df['roe'].fillna(0) + df['dv_ratio'].fillna(0)
-    top_combo = df.nlargest(3, 'score').copy()
+    df['score'] = fill_zero(df['roe']) + fill_zero(df['dv_ratio'])
+    top_combo = df.loc[top_k(df['score'], 3)]
     top_combo['维度'] = '综合'
     
     # 合并所有
@@ -251,35 +435,99 @@ def show_top3(df, token):
     print(all_top.to_string(index=False))
 
 
+def get_github_session():
+    """获取复用的GitHub会话 (keep-alive连接池 + 失败重试)"""
+    global _GH_SESSION
+    with _GH_SESSION_LOCK:
+        if _GH_SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            # 重试用尽后返回最后的响应，由调用方按状态码处理
+            retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504],
+                          raise_on_status=False)
+            session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry))
+            session.headers.update({'Authorization': f'token {GITHUB_TOKEN}'})
+            _GH_SESSION = session
+        return _GH_SESSION
+
+
+def format_results(result):
+    """按列向量化格式化结果，每只股票一行"""
+    def text(col, width):
+        if col in result.columns:
+            return result[col].astype(str).str.ljust(width)
+        return pd.Series(' ' * width, index=result.index)
+    
+    def number(col, fmt):
+        if col in result.columns:
+            values = pd.to_numeric(result[col], errors='coerce')
+        else:
+            values = pd.Series(0.0, index=result.index)
+        return values.map(fmt.format)
+    
+    lines = (
+        text('ts_code', 6) + ' ' + text('name', 8) +
+        ' 现价:' + number('close', '{:6.2f}') +
+        ' PE:' + number('pe_ttm', '{:6.1f}') +
+        ' PB:' + number('pb', '{:4.2f}') +
+        ' ROE:' + number('roe', '{:4.1f}') + '%' +
+        ' 股息:' + number('dv_ratio', '{:4.1f}') + '%' +
+        ' 换手:' + number('turnover_rate', '{:4.1f}') + '%'
+    )
+    return '\n'.join(lines)
+
+
+def save_history(df, date_str):
+    """本地保存parquet格式的筛选结果，便于后续回测读取 (未安装pyarrow时跳过)"""
+    if not HAS_PARQUET:
+        return False
+    
+    path = HISTORY_DIR / f'low_valuation_{date_str}.parquet'
+    try:
+        HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, compression='zstd', index=False)
+    except Exception as e:
+        print(f"  本地保存失败: {e}")
+        return False
+    print(f"✓ 已保存到本地: {path}")
+    return True
+
+
 def save_to_github(df, subdir='value-other-side'):
-    """保存结果到GitHub"""
-    import requests
+    """保存结果到GitHub，并在本地保留一份parquet (未设置GITHUB_TOKEN时也会保存本地)"""
     from base64 import b64encode
     
+    date_str = datetime.datetime.now().strftime('%Y-%m-%d')
+    save_history(df, date_str)
+    
     if not GITHUB_TOKEN:
         print("Warning: GITHUB_TOKEN not set, skipping save")
         return False
     
-    date_str = datetime.datetime.now().strftime('%Y-%m-%d')
-    content = df.to_csv(index=False, encoding='utf-8-sig')
+    # 提前编码好上传内容，GET/PUT及重试共用
+    content_b64 = b64encode(df.to_csv(index=False).encode('utf-8-sig')).decode('ascii')
     
     filename = f'low_valuation_{date_str}.csv'
     url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/contents/{subdir}/data/{filename}"
     
     # 检查文件是否存在
-    response = requests.get(url, headers={'Authorization': f'token {GITHUB_TOKEN}'})
+    session = get_github_session()
+    response = session.get(url)
     sha = response.json().get('sha') if response.status_code == 200 else None
     
     # 上传文件
     data = {
         'message': f'update: {date_str} 低估股票筛选结果',
-        'content': b64encode(content.encode('utf-8')).decode('utf-8'),
+        'content': content_b64,
         'branch': BRANCH
     }
     if sha:
         data['sha'] = sha
     
-    response = requests.put(url, json=data, headers={'Authorization': f'token {GITHUB_TOKEN}'})
+    response = session.put(url, json=data)
     
     if response.status_code in [200, 201]:
         print(f"✓ 已保存到 GitHub: {subdir}/data/{filename}")
@@ -310,7 +558,7 @@ def main():
     parser.add_argument('-t', '--token', type=str, 
                         help='Tushare token (或设置环境变量 TUSHARE_TOKEN)')
     parser.add_argument('-s', '--save', action='store_true',
-                        help='保存结果到GitHub')
+                        help='保存结果到GitHub，并在 ~/.cache/value-other-side/history/ 保留parquet副本')
     parser.add_argument('--no-bank', action='store_true', default=True,
                         help='排除银行股 (默认开启)')
     parser.add_argument('--no-broker', action='store_true', default=True,
@@ -395,14 +643,8 @@ def main():
     display_cols = ['code', 'name', 'close', 'pe', 'pb', 'turnoverratiof']
     display_cols = [c for c in display_cols if c in result.columns]
     
-    for i, row in result.iterrows():
-        print(f"{row.get('ts_code', ''):6} {row.get('name', ''):8} "
-              f"现价:{row.get('close', 0):6.2f} "
-              f"PE:{row.get('pe_ttm', 0):6.1f} "
-              f"PB:{row.get('pb', 0):4.2f} "
-              f"ROE:{row.get('roe', 0):4.1f}% "
-              f"股息:{row.get('dv_ratio', 0):4.1f}% "
-              f"换手:{row.get('turnover_rate', 0):4.1f}%")
+    if len(result) > 0:
+        print(format_results(result))
     
     # 保存
     if args.save: